@@ -78,7 +78,7 @@ def plan(ctx: Context, all_artifacts: bool, force: bool):
 
     if revision is None:
         if all_artifacts:
-            available_artifacts = list(strategy.artifacts().keys())
+            available_artifacts = list(strategy.artifacts())
         else:
             available_artifacts = [
                 addr for addr, art in strategy.artifacts().items() if art.exists(ctx)
@@ -1,4 +1,6 @@
 """Representation of an address for any artifact or step."""
+import sys
+from functools import lru_cache
 from typing import Optional
 
 from attrs import define, field
@@ -28,7 +30,7 @@ def is_valid_name(name: str) -> bool:
     return all((ch.isalnum() or ch == "-") for ch in name)
 
 
-@define(frozen=True, kw_only=True, order=True)
+@define(frozen=True, kw_only=True, order=True, slots=True, cache_hash=True)
 class Address:
     """Represent an address used to identify a step or artifact in a deploy
     strategy.
@@ -41,7 +43,8 @@ class Address:
 
     base: str
     name: str = field()
-    attr: Optional[str] = field(default=None)
+    # two addresses pointing to different attributes of the same spec are equal
+    attr: Optional[str] = field(default=None, eq=False)
 
     @name.validator
     def check_name(self, _, value):  # pylint: disable=no-self-use
@@ -55,14 +58,12 @@ class Address:
     def __repr__(self):
         return f"Address({self.base!r}, {self.name!r})"
 
-    def __eq__(self, other: object) -> bool:
-        if isinstance(other, Address):
-            return self.base == other.base and self.name == other.name
+    def __copy__(self) -> "Address":
+        return self
 
-        return False
-
-    def __hash__(self) -> int:
-        return hash(str(self))
+    def __deepcopy__(self, memo) -> "Address":
+        # addresses are immutable so copies can share the same instance.
+        return self
 
     @classmethod
     def from_string(cls, base: str, addr: str) -> "Address":
@@ -83,27 +84,32 @@ class Address:
         Raises:
             ValueError: if the address is invalid.
         """
-        if addr.startswith(":"):
-            postfix = addr[1:]
+        return _parse_address(base, addr)
+
+    @property
+    def without_attr(self) -> "Address":
+        """Returns the address without the attr part."""
+        return _parse_address(self.base, f":{self.name}")
 
-        elif addr.startswith("//"):
-            base, _, postfix = addr[2:].rpartition(":")
 
-        else:
-            raise ValueError(f"invalid address format {addr}")
+@lru_cache(maxsize=4096)
+def _parse_address(base: str, addr: str) -> Address:
+    # addresses are immutable, so the same string always maps to a shared
+    # instance and lookups keyed by it hit the identity check first.
+    if addr.startswith(":"):
+        postfix = addr[1:]
 
-        name, _, attr = postfix.partition("#")
+    elif addr.startswith("//"):
+        base, _, postfix = addr[2:].rpartition(":")
+        base = sys.intern(base)
 
-        return Address(
-            base=base,
-            name=name,
-            attr=attr if attr else None,
-        )
+    else:
+        raise ValueError(f"invalid address format {addr}")
 
-    @property
-    def without_attr(self) -> "Address":
-        """Returns the address without the attr part."""
-        return Address(
-            base=self.base,
-            name=self.name,
-        )
+    name, _, attr = postfix.partition("#")
+
+    return Address(
+        base=base,
+        name=name,
+        attr=attr if attr else None,
+    )
@@ -1,3 +1,5 @@
+import copy
+
 import pytest
 from testfixtures import ShouldRaise, compare
 
@@ -125,3 +127,26 @@ def test_Address_from_address__raise_ValueError_if_address_is_invalid(base, addr
 )
 def test_Address_without_attr__removes_attr(address, expected):
     compare(address, expected)
+
+
+def test_Address_from_string__returns_shared_instance():
+    first = Address.from_string("treb", ":foo#bar")
+    second = Address.from_string("treb", ":foo#bar")
+
+    compare(first is second, True)
+
+
+def test_Address_deepcopy__returns_same_instance():
+    address = Address(base="foo", name="bar", attr="spam")
+
+    res = copy.deepcopy(address)
+
+    compare(res is address, True)
+
+
+def test_Address_copy__returns_same_instance():
+    address = Address(base="foo", name="bar", attr="spam")
+
+    res = copy.copy(address)
+
+    compare(res is address, True)
@@ -1,5 +1,5 @@
 """Definiton of the context capturing all the data needed to run treb."""
-from typing import Dict
+from typing import Dict, Type
 
 from attrs import define, field
 
@@ -20,7 +20,7 @@ class Context:
 
     config: Config
     revision: str
-    specs: Dict[str, Spec] = field(factory=dict)
+    specs: Dict[str, Type[Spec]] = field(factory=dict)
 
 
 def load_context(config: Config, revision: str) -> Context:
@@ -32,13 +32,13 @@ def load_context(config: Config, revision: str) -> Context:
     Retruns:
         The context.
     """
-    specs = {}
+    specs: Dict[str, Type[Spec]] = {}
 
     for plugin_path in config.plugins:
         plugin = load_plugin(plugin_path)
 
         for spec in plugin.specs():
-            name = spec.spec_name()
+            name = spec.spec_name
             if name in specs:
                 raise ValueError(f"spec with name {name} is already present")
 
@@ -52,16 +52,15 @@ def discover_deploy_files(
         A deploy file found.
     """
     for (dirpath, _, filenames) in os.walk(root):
-        for filename in filenames:
-            if filename != deploy_filename:
-                continue
+        if deploy_filename not in filenames:
+            continue
 
-            path = os.path.join(dirpath, filename)
+        path = os.path.join(dirpath, deploy_filename)
 
-            with open(path, encoding="utf-8") as file_deploy:
-                code = file_deploy.read()
+        with open(path, encoding="utf-8") as file_deploy:
+            code = file_deploy.read()
 
-            yield DeployFile(
-                path=path,
-                code=code,
-            )
+        yield DeployFile(
+            path=path,
+            code=code,
+        )
@@ -1,17 +1,70 @@
 """Rules for planning and executing a treb deploy strategy."""
-import copy
 import inspect
-from typing import Any, Dict, Iterable, Tuple, cast
+from types import NoneType
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type, TypeVar, cast
 
-from attrs import evolve
+from attrs import evolve, fields
 from cattrs import structure, unstructure
 
 from treb.core.address import Address
 from treb.core.check import Check, FailedCheck
 from treb.core.plan import Action, ActionState, ActionType, Plan, resolve_addresses
+from treb.core.spec import Spec
 from treb.core.step import Step
 from treb.core.strategy import Strategy
-from treb.utils import error, print_waiting, rollback, success
+from treb.utils import error, memoize, print_waiting, rollback, success
+
+SpecT = TypeVar("SpecT", bound=Spec)
+
+
+@memoize
+def _snapshot_type(cls: Type[Step]) -> Any:
+    return inspect.signature(cls.snapshot).return_annotation
+
+
+@memoize
+def _init_fields(cls: Type[Spec]) -> Tuple[Tuple[str, str], ...]:
+    # pairs of attribute and `__init__` argument names, same as those used by
+    # `attrs.evolve`, computed once per spec class.
+    return tuple((field.name, field.alias) for field in fields(cls) if field.init)
+
+
+def _with_dependencies(spec: SpecT, dep_artifacts: Dict[str, Any]) -> SpecT:
+    # same as `attrs.evolve` without inspecting the class fields on every
+    # action, the dependencies are keyed by attribute name even for fields
+    # with an alias.
+    kwargs = {
+        alias: dep_artifacts[name] if name in dep_artifacts else getattr(spec, name)
+        for name, alias in _init_fields(type(spec))
+    }
+
+    return type(spec)(**kwargs)
+
+
+def _structure(value: Any, cls: Any) -> Any:
+    # steps without a snapshot skip the converter entirely.
+    if cls is None or cls is NoneType:
+        return None
+
+    return structure(value, cls)
+
+
+def _resolve_dependencies(strategy: Strategy, address: Address, results) -> Dict[str, Any]:
+    # only the fields referring to other addresses change when resolved, the
+    # others are already set on the spec.
+    return {
+        name: resolve_addresses(value, results)
+        for name, value in strategy.address_fields(address).items()
+    }
+
+
+def _replace_action(plan: Plan, action_idx: int, action: Action) -> Plan:
+    # actions are immutable so the new plan can share them with the old one
+    # instead of copying them.
+    actions = plan.actions.copy()
+    actions[action_idx] = action
+
+    return evolve(plan, actions=actions)
 
 
 def _execute_plan_planned(strategy: Strategy, plan: Plan, action_idx: int, results) -> Plan:
@@ -22,9 +75,6 @@ def _execute_plan_planned(strategy: Strategy, plan: Plan, action_idx: int, resul
     )
 
     if action.type is ActionType.RUN:
-        action = plan.actions[action_idx]
-        new_actions = copy.deepcopy(plan.actions)
-
         step = strategy.steps().get(action.address)
         if step is None:
             raise ValueError(f"step {action.address} does not exist")
@@ -32,30 +82,21 @@ def _execute_plan_planned(strategy: Strategy, plan: Plan, action_idx: int, resul
         if not isinstance(step, Step):
             raise TypeError(f"node {action.address} is not a step")
 
-        dep_artifacts = resolve_addresses(
-            strategy.dependencies(action.address),
-            results,
-        )
-        item = evolve(step, **dep_artifacts)
+        dep_artifacts = _resolve_dependencies(strategy, action.address, results)
+        item = _with_dependencies(step, dep_artifacts)
 
         snapshot = item.snapshot(strategy.ctx())
         new_action = evolve(new_action, snapshot=unstructure(snapshot))
 
-    new_actions = copy.deepcopy(plan.actions)
-    new_actions[action_idx] = new_action
-
-    return evolve(plan, actions=new_actions)
+    return _replace_action(plan, action_idx, new_action)
 
 
 def _perform_run(strategy: Strategy, address: Address, snapshot, step: Step, results):
-    dep_artifacts = resolve_addresses(
-        strategy.dependencies(address),
-        results,
-    )
-    item = evolve(step, **dep_artifacts)
+    dep_artifacts = _resolve_dependencies(strategy, address, results)
+    item = _with_dependencies(step, dep_artifacts)
 
     if isinstance(step, Step):
-        decoded_snapshot = structure(snapshot, inspect.signature(item.snapshot).return_annotation)
+        decoded_snapshot = _structure(snapshot, _snapshot_type(type(item)))
 
     else:
         decoded_snapshot = None
@@ -70,12 +111,9 @@ def _perform_run(strategy: Strategy, address: Address, snapshot, step: Step, res
 
 
 def _perform_check(strategy: Strategy, address: Address, check: Check, results):
-    dep_artifacts = resolve_addresses(
-        strategy.dependencies(address),
-        results,
-    )
+    dep_artifacts = _resolve_dependencies(strategy, address, results)
 
-    check = evolve(check, **dep_artifacts)
+    check = _with_dependencies(check, dep_artifacts)
 
     try:
         with print_waiting(f"check {address}"):
@@ -92,13 +130,10 @@ def _perform_check(strategy: Strategy, address: Address, check: Check, results):
 
 
 def _perform_rollback(strategy: Strategy, address: Address, snapshot, step: Step, results):
-    dep_artifacts = resolve_addresses(
-        strategy.dependencies(address),
-        results,
-    )
-    item = evolve(step, **dep_artifacts)
+    dep_artifacts = _resolve_dependencies(strategy, address, results)
+    item = _with_dependencies(step, dep_artifacts)
 
-    decoded_snapshot = structure(inspect.signature(item.snapshot).return_annotation, snapshot)
+    decoded_snapshot = _structure(snapshot, _snapshot_type(type(item)))
 
     with print_waiting(f"rollback {address}"):
         res = item.rollback(strategy.ctx(), decoded_snapshot)
@@ -115,8 +150,6 @@ def _execute_plan_in_progress(
 ) -> Tuple[Plan, bool]:
     action = plan.actions[action_idx]
     spec = strategy.specs().get(action.address)
-    new_actions = copy.deepcopy(plan.actions)
-    results = copy.deepcopy(results)
 
     start_rollback = False
 
@@ -160,10 +193,81 @@ def _execute_plan_in_progress(
         new_action = evolve(action, state=ActionState.DONE, result=exc.result)
         start_rollback = action.state is not ActionType.ROLLBACK
 
-    new_actions[action_idx] = new_action
-    plan = evolve(plan, actions=new_actions)
+    return _replace_action(plan, action_idx, new_action), start_rollback
+
+
+def _resolve_artifacts(strategy: Strategy) -> Dict[Address, Any]:
+    # artifacts are resolved one at a time, plugins print their progress through
+    # the module-global helpers in `treb.utils` which are not thread-safe.
+    ctx = strategy.ctx()
+
+    return {
+        addr: artifact.resolve(ctx)
+        for addr, artifact in strategy.artifacts().items()
+        if artifact.exists(ctx)
+    }
+
+
+def _start_rollback(plan: Plan, action_idx: int) -> Plan:
+    # done actions are shared with the new plan, only the cancelled and the
+    # rollback actions are created.
+    done_actions = plan.actions[: action_idx + 1]
+    cancelled_actions = [
+        evolve(planned_action, state=ActionState.CANCELLED)
+        for planned_action in plan.actions[action_idx + 1 :]
+    ]
+    rollback_actions = [
+        Action(
+            type=ActionType.ROLLBACK,
+            address=done_action.address,
+            state=ActionState.PLANNED,
+            result=None,
+            error=None,
+        )
+        for done_action in reversed(done_actions)
+        if done_action.type is ActionType.RUN
+    ]
+
+    return evolve(plan, actions=done_actions + cancelled_actions + rollback_actions)
+
+
+def _handle_planned(
+    strategy: Strategy, plan: Plan, action_idx: int, results
+) -> Tuple[Optional[Plan], int]:
+    return _execute_plan_planned(strategy, plan, action_idx, results), action_idx
+
+
+def _handle_in_progress(
+    strategy: Strategy, plan: Plan, action_idx: int, results
+) -> Tuple[Optional[Plan], int]:
+    action = plan.actions[action_idx]
+    plan, start_rollback = _execute_plan_in_progress(strategy, plan, action_idx, results)
+
+    results[action.address] = plan.actions[action_idx].result
+
+    if start_rollback:
+        plan = _start_rollback(plan, action_idx)
+
+    return plan, action_idx + 1
+
 
-    return plan, start_rollback
+def _handle_completed(
+    strategy: Strategy, plan: Plan, action_idx: int, results  # pylint: disable=unused-argument
+) -> Tuple[Optional[Plan], int]:
+    return None, action_idx + 1
+
+
+# the handler for each action state returns the new plan to yield, if any, and
+# the index of the next action to handle.
+_ACTION_STATE_HANDLERS: Dict[
+    ActionState, Callable[[Strategy, Plan, int, Any], Tuple[Optional[Plan], int]]
+] = {
+    ActionState.PLANNED: _handle_planned,
+    ActionState.IN_PROGRESS: _handle_in_progress,
+    ActionState.FAILED: _handle_completed,
+    ActionState.DONE: _handle_completed,
+    ActionState.CANCELLED: _handle_completed,
+}
 
 
 def execute_plan(strategy: Strategy, plan: Plan) -> Iterable[Plan]:
@@ -178,60 +282,22 @@ def execute_plan(strategy: Strategy, plan: Plan) -> Iterable[Plan]:
     Yields:
         A new state of the after each action state change.
     """
-    results: Dict[Address, Any] = {
-        addr: art.resolve(strategy.ctx())
-        for addr, art in strategy.artifacts().items()
-        if art.exists(strategy.ctx())
-    } | strategy.resources()
+    # a single mapping holds artifacts, resources and step results for the whole
+    # execution, each action only adds its own result to it.
+    results: Dict[Address, Any] = _resolve_artifacts(strategy)
+    results.update(strategy.resources())
 
     idx = 0
 
-    while True:
-        if idx >= len(plan.actions):
-            break
-
-        action = plan.actions[idx]
-
-        match action.state:
-            case ActionState.PLANNED:
-                plan = _execute_plan_planned(strategy, plan, idx, results)
-
-                yield plan
-
-            case ActionState.IN_PROGRESS:
-                plan, start_rollback = _execute_plan_in_progress(strategy, plan, idx, results)
+    while idx < len(plan.actions):
+        handler = _ACTION_STATE_HANDLERS.get(plan.actions[idx].state)
 
-                results[action.address] = plan.actions[idx].result
+        if handler is None:
+            raise ValueError(f"unexpected action state {plan.actions[idx].state}")
 
-                if start_rollback:
-                    done_actions = plan.actions[: idx + 1]
-                    cancelled_actions = []
-                    rollback_actions = []
+        new_plan, idx = handler(strategy, plan, idx, results)
 
-                    for planned_action in plan.actions[idx + 1 :]:
-                        cancelled_actions.append(
-                            evolve(planned_action, state=ActionState.CANCELLED)
-                        )
+        if new_plan is not None:
+            plan = new_plan
 
-                    for done_action in reversed(done_actions):
-                        if done_action.type is ActionType.RUN:
-                            rollback_actions.append(
-                                Action(
-                                    type=ActionType.ROLLBACK,
-                                    address=done_action.address,
-                                    state=ActionState.PLANNED,
-                                    result=None,
-                                    error=None,
-                                )
-                            )
-                    plan = evolve(plan, actions=done_actions + cancelled_actions + rollback_actions)
-
-                yield plan
-
-                idx += 1
-
-            case ActionState.FAILED | ActionState.DONE | ActionState.CANCELLED:
-                idx += 1
-
-            case _:
-                raise ValueError(f"unexpected action state {action.state}")
+            yield plan
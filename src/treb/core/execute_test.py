@@ -1,7 +1,7 @@
 from typing import Optional
 
 import pytest
-from attrs import define
+from attrs import define, field
 from testfixtures import compare
 
 from treb.core.address import Address
@@ -22,9 +22,7 @@ class Dummy:
 
 @define(frozen=True, kw_only=True)
 class ArtifactTest(Artifact):
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_artifact"
+    spec_name = "test_artifact"
 
     def resolve(self, ctx: Context) -> Dummy:
         return Dummy()
@@ -38,9 +36,7 @@ class ResourceTest:
 
 @define(frozen=True, kw_only=True)
 class ResourceTestSpec(Resource):
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_resource"
+    spec_name = "test_resource"
 
     def state(self, ctx: Context) -> Optional[ResourceTest]:
         return ResourceTest(foo="bar")
@@ -52,9 +48,7 @@ class StepTest(Step):
     artifact: ArtifactTest
     resource: ResourceTestSpec
 
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_step"
+    spec_name = "test_step"
 
     def snapshot(self, ctx: "Context") -> None:
         return None
@@ -66,15 +60,31 @@ class StepTest(Step):
         pass
 
 
+@define(frozen=True, kw_only=True)
+class AliasedStepTest(Step):
+
+    artifact: ArtifactTest = field(alias="image")
+    label: str = field(alias="title")
+
+    spec_name = "test_aliased_step"
+
+    def snapshot(self, ctx: "Context") -> None:
+        return None
+
+    def run(self, ctx: Context, snapshot: None) -> dict:
+        return {"resolved": isinstance(self.artifact, Dummy), "label": self.label}
+
+    def rollback(self, ctx: Context, snapshot: None):
+        pass
+
+
 @define(frozen=True, kw_only=True)
 class CheckTest(Check):
 
     resource: ResourceTestSpec
     fail: bool = False
 
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_check"
+    spec_name = "test_check"
 
     def check(self, ctx: Context) -> dict:
         if self.fail:
@@ -136,7 +146,7 @@ def test_execute_plan__run_all_actions_successfully():
 
     plan = generate_plan(
         strategy,
-        list(strategy.artifacts().keys()),
+        list(strategy.artifacts()),
     )
 
     res = list(execute_plan(strategy, plan))
@@ -244,7 +254,7 @@ def test_execute__fail_check_and_start_rollback():
 
     plan = generate_plan(
         strategy,
-        list(strategy.artifacts().keys()),
+        list(strategy.artifacts()),
     )
 
     res = list(execute_plan(strategy, plan))
@@ -425,3 +435,22 @@ def test_execute__fail_check_and_start_rollback():
             ),
         ],
     )
+
+
+def test_execute_plan__run_step_with_aliased_field(treb_context):
+    strategy = Strategy(treb_context)
+
+    strategy.register_artifact("root", ArtifactTest(name="artifact"))
+    strategy.register_step(
+        "root",
+        AliasedStepTest(name="step", image=Address(base="root", name="artifact"), title="foo"),
+    )
+
+    plan = generate_plan(
+        strategy,
+        list(strategy.artifacts()),
+    )
+
+    res = list(execute_plan(strategy, plan))
+
+    compare(res[-1].actions[0].result, {"resolved": True, "label": "foo"})
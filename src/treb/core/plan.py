@@ -1,9 +1,11 @@
 """Functions and data structures to handle and represent a strategy plan
 describing all the actions needed to complete a deployment."""
 import enum
+import heapq
 import operator
-from functools import singledispatch
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from collections import defaultdict, deque
+from functools import lru_cache, singledispatch
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from attrs import define, evolve, fields
 from attrs import has as has_attrs
@@ -89,8 +91,12 @@ class UnresolvableAddress(Exception):
         self.address = address
 
 
-@singledispatch
-def resolve_addresses(value, mapping):  # pylint: disable=unused-argument
+_LEAF_TYPES = frozenset({str, int, float, bool, type(None)})
+
+_MISSING = object()
+
+
+def resolve_addresses(value, mapping):
     """Visits the dependency addresses in `addresses` and creates a dictionary
     with the same structure but replacing all the addresses with its
     corresponding artifact using the mapping `items`.
@@ -105,6 +111,20 @@ def resolve_addresses(value, mapping):  # pylint: disable=unused-argument
         A copy of the dictionary with the addresses replaced by the artifacts.
         `None` if any of the addresses cannot be resolved.
     """
+    return _resolve(value, mapping)
+
+
+def _resolve(value, mapping):
+    # primitive values are the most common leaves and never contain addresses,
+    # return them straight away instead of going through the dispatcher.
+    if type(value) in _LEAF_TYPES:
+        return value
+
+    return _resolve_addresses(value, mapping)
+
+
+@singledispatch
+def _resolve_addresses(value, mapping):  # pylint: disable=unused-argument
     if has_attrs(value):
         return resolve_addresses_attrs(value, mapping)
 
@@ -116,60 +136,63 @@ def resolve_addresses_attrs(value: Address, mapping) -> Any:
     return evolve(
         value,
         **{
-            field.name: resolve_addresses(getattr(value, field.name), mapping)
+            field.name: _resolve(getattr(value, field.name), mapping)
             for field in fields(type(value))
         },
     )
 
 
-@resolve_addresses.register
+@lru_cache(maxsize=None)
+def _attr_getter(attr: str) -> operator.attrgetter:
+    return operator.attrgetter(attr)
+
+
+@_resolve_addresses.register
 def resolve_addresses_address(value: Address, mapping) -> Any:
     """See `resolve_addresses`."""
-    try:
-        resolved = mapping[value]
+    resolved = mapping.get(value, _MISSING)
 
-        if value.attr is None:
-            return resolved
+    if resolved is _MISSING:
+        raise UnresolvableAddress(value)
 
-        return operator.attrgetter(value.attr)(resolved)
+    if value.attr is None:
+        return resolved
 
-    except KeyError as exc:
-        raise UnresolvableAddress(value) from exc
+    return _attr_getter(value.attr)(resolved)
 
 
-@resolve_addresses.register
+@_resolve_addresses.register
 def resolve_addresses_dict(value: dict, mapping) -> dict:
     """See `resolve_addresses`."""
-    return {key: resolve_addresses(nested_value, mapping) for key, nested_value in value.items()}
+    resolved: dict = {}
+
+    for key, nested_value in value.items():
+        resolved[key] = _resolve(nested_value, mapping)
+
+    return resolved
 
 
-@resolve_addresses.register
+@_resolve_addresses.register
 def resolve_addresses_list(value: list, mapping) -> list:
     """See `resolve_addresses`."""
-    return [resolve_addresses(nested_value, mapping) for nested_value in value]
+    resolved = [None] * len(value)
 
+    for idx, nested_value in enumerate(value):
+        resolved[idx] = _resolve(nested_value, mapping)
 
-@resolve_addresses.register
+    return resolved
+
+
+@_resolve_addresses.register
 def resolve_addresses_tuple(value: tuple, mapping) -> tuple:
     """See `resolve_addresses`."""
-    return tuple(resolve_addresses(nested_value, mapping) for nested_value in value)
+    return tuple(_resolve(nested_value, mapping) for nested_value in value)
 
 
-@resolve_addresses.register
+@_resolve_addresses.register
 def resolve_addresses_set(value: set, mapping) -> set:
     """See `resolve_addresses`."""
-    return {resolve_addresses(nested_value, mapping) for nested_value in value}
-
-
-_DUMMY = object()
-
-
-class _ResultPlaceholder:
-    def __getattr__(self, name):
-        return _DUMMY
-
-
-_RESULT_PLACEHOLDER = _ResultPlaceholder()
+    return {_resolve(nested_value, mapping) for nested_value in value}
 
 
 class UnknownAddresses(Exception):
@@ -199,75 +222,167 @@ def _get_action_type(spec: Spec) -> ActionType:
     raise TypeError(f"spec of type {type(spec).__name__} cannot create an action")
 
 
+def iter_addresses(value) -> Iterator[Address]:
+    """Yields all the addresses in `value` following the same order used by
+    `resolve_addresses`.
+
+    Arguments:
+        value: the value to search for addresses.
+
+    Yields:
+        An address found in the value.
+    """
+    if isinstance(value, Address):
+        yield value
+        return
+
+    nested_values: Iterable[Any]
+
+    if isinstance(value, dict):
+        nested_values = value.values()
+
+    elif isinstance(value, (list, tuple, set)):
+        nested_values = value
+
+    elif has_attrs(type(value)):
+        nested_values = [getattr(value, field.name) for field in fields(type(value))]
+
+    else:
+        return
+
+    for nested_value in nested_values:
+        # most spec fields hold plain values, skipping them avoids creating a
+        # nested generator for each one.
+        if type(nested_value) not in _LEAF_TYPES:
+            yield from iter_addresses(nested_value)
+
+
+def has_addresses(value) -> bool:
+    """Checks if `value` contains at least one address.
+
+    Arguments:
+        value: the value to search for addresses.
+
+    Returns:
+        True if an address is found in the value. Otherwise false.
+    """
+    if type(value) in _LEAF_TYPES:
+        return False
+
+    return next(iter_addresses(value), None) is not None
+
+
 def generate_plan(  # pylint: disable=too-many-locals
     strategy: "Strategy",
     available_artifacts: List[Address],
 ) -> Plan:
     """Generates a new plan for the deployment strategy.
 
+    The steps are sorted topologically and, among the steps ready to be planned,
+    they are ordered by address.
+
+    Steps waiting only for artifacts that are not available, directly or through
+    other skipped steps, are skipped.
+
     Arguments:
         strategy: the deployment strategy defined for the project.
         available_artifacts: all the artifacts built for the current revision.
 
     Returns:
         The plan with all the steps to deploy the available artifacts.
+
+    Raises:
+        UnknownAddresses: if some steps depend on addresses that cannot be resolved.
     """
     steps = strategy.steps()
 
-    artifacts: Dict[Address, Any] = {addr: _RESULT_PLACEHOLDER for addr in available_artifacts}
-    resources = strategy.resources()
+    available = frozenset(available_artifacts)
+    resolved: Set[Address] = set(available) | set(strategy.resources())
 
-    actions = []
-    results: Dict[Address, Any] = artifacts | resources
+    dependency_addresses = strategy.dependency_addresses
+    after_addresses = strategy.after_addresses
 
-    prev_steps = None
-    unresolvable_addresses: List[Address] = []
-    skip_addresses: Set[Address] = set(
-        addr for addr in strategy.artifacts() if addr not in available_artifacts
-    )
+    # the `after` addresses follow the dependencies, so UnknownAddresses reports
+    # a blocking dependency before a blocking `after` address.
+    step_deps: Dict[Address, Tuple[Address, ...]] = {}
+    waiting: Dict[Address, Set[Address]] = {}
+    dependents: Dict[Address, List[Address]] = defaultdict(list)
+
+    for step_addr in steps:
+        deps = dependency_addresses(step_addr) + after_addresses(step_addr)
+
+        step_deps[step_addr] = deps
+        waiting[step_addr] = set(deps).difference(resolved)
 
-    while steps:
-        if list(sorted(steps.items())) == prev_steps:
-            raise UnknownAddresses(addresses=unresolvable_addresses)
+        for addr in waiting[step_addr]:
+            dependents[addr].append(step_addr)
 
-        prev_steps = list(sorted(steps.items()))
+    # each step is ranked by the pass in which it would be planned when scanning
+    # the steps in address order, so ties are broken in the same way.
+    ready = [(0, addr) for addr, pending in waiting.items() if not pending]
+    heapq.heapify(ready)
 
-        unresolvable_addresses = []
+    action_type = _get_action_type
+    planned = ActionState.PLANNED
+    action_cls = Action
 
-        for step_addr, step in list(sorted(steps.items())):
-            if step_addr in skip_addresses:
-                continue
+    actions = []
+
+    while ready:
+        rank, step_addr = heapq.heappop(ready)
+
+        actions.append(
+            action_cls(
+                type=action_type(steps[step_addr]),
+                address=step_addr,
+                state=planned,
+                result=None,
+                error=None,
+            )
+        )
+        resolved.add(step_addr)
 
-            dep_addresses = strategy.dependencies(step_addr)
+        for dependent in dependents.get(step_addr, ()):
+            pending = waiting[dependent]
+            pending.discard(step_addr)
 
-            try:
-                resolve_addresses(dep_addresses, results)
+            if not pending:
+                heapq.heappush(ready, (rank if step_addr < dependent else rank + 1, dependent))
 
-            except UnresolvableAddress as exc:
-                unresolvable_addresses.append(exc.address)
-                if exc.address in skip_addresses:
-                    skip_addresses.add(step_addr)
-                    del steps[step_addr]
+    # a step is skipped only when everything it is still waiting for is an
+    # unavailable artifact or another skipped step. Steps also waiting for an
+    # unknown address or for a cycle are never skipped, they are reported below.
+    skip_addresses: Set[Address] = set(strategy.artifacts()) - available
+    to_skip = deque(skip_addresses)
 
-                continue
+    while to_skip:
+        skipped_addr = to_skip.popleft()
 
-            after = [Address.from_string(step_addr.base, address) for address in step.after]
-            all_after_resolved = all(address in results for address in after)
-            if not all_after_resolved:
-                continue
+        for step_addr in dependents.get(skipped_addr, ()):
+            pending = waiting[step_addr]
+            pending.discard(skipped_addr)
+
+            if not pending and step_addr not in skip_addresses:
+                skip_addresses.add(step_addr)
+                to_skip.append(step_addr)
+
+    unresolved_steps = sorted(
+        addr for addr in steps if addr not in resolved and addr not in skip_addresses
+    )
 
-            actions.append(
-                Action(
-                    type=_get_action_type(step),
-                    address=step_addr,
-                    state=ActionState.PLANNED,
-                    result=None,
-                    error=None,
-                )
+    if unresolved_steps:
+        # a step left here still waits for an address that is neither resolved
+        # nor skipped: an unknown address or a step stuck in a cycle.
+        unresolvable_addresses = [
+            next(
+                addr
+                for addr in step_deps[step_addr]
+                if addr not in resolved and addr not in skip_addresses
             )
+            for step_addr in unresolved_steps
+        ]
 
-            del steps[step_addr]
-            results[step_addr] = _RESULT_PLACEHOLDER
+        raise UnknownAddresses(addresses=unresolvable_addresses)
 
     return Plan(
         actions=actions,
@@ -16,6 +16,7 @@ from treb.core.plan import (
     UnknownAddresses,
     UnresolvableAddress,
     generate_plan,
+    has_addresses,
     resolve_addresses,
 )
 from treb.core.resource import Resource
@@ -41,238 +42,97 @@ def treb_context(tmp_path_factory) -> Context:
     return ctx
 
 
-def test_resolve_addresses__single_resolvable_address_returns_mapped_value():
-    res = resolve_addresses(
-        Address(base="a", name="b"),
-        {Address(base="a", name="b"): 1, Address(base="c", name="d"): "spam"},
-    )
-
-    compare(res, 1)
-
-
-def test_resolve_addresses__single_unresolvable_address_raises_UnresolvableAddress():
-    with ShouldRaise(UnresolvableAddress) as exc:
-        resolve_addresses(
-            Address(base="not", name="found"),
-            {Address(base="a", name="b"): 1, Address(base="c", name="d"): "spam"},
-        )
+ADDR_A_B = Address(base="a", name="b")
+ADDR_C_D = Address(base="c", name="d")
+ADDR_E_F = Address(base="e", name="f")
+ADDR_NOT_FOUND = Address(base="not", name="found")
 
-    compare(exc.raised.address, Address(base="not", name="found"))
 
+@define
+class Nested:
+    y: str
 
-def test_resolve_addresses__single_resolvable_address_with_attr_returns_mapped_value():
-    @define
-    class Data:
-        x: int
-        y: float
-
-    mapping = {Address(base="a", name="b"): Data(x=1, y=2.3)}
-
-    res = resolve_addresses(
-        Address(base="a", name="b", attr="x"),
-        mapping,
-    )
-
-    compare(res, 1)
-
-    res = resolve_addresses(
-        Address(base="a", name="b", attr="y"),
-        mapping,
-    )
 
-    compare(res, 2.3)
+@define
+class Data:
+    x: int
+    y: float
+    nested: Optional[Nested] = None
 
 
-def test_resolve_addresses__single_resolvable_address_with_nested_attr_returns_mapped_value():
-    @define
-    class Nested:
-        y: str
+MAPPING = {ADDR_A_B: 11, ADDR_C_D: "spam", ADDR_E_F: "hi"}
+MAPPING_DATA = {ADDR_A_B: Data(x=1, y=2.3, nested=Nested(y="foo"))}
 
-    @define
-    class Data:
-        x: int
-        y: float
-        nested: Nested
 
-    mapping = {Address(base="a", name="b"): Data(x=1, y=2.3, nested=Nested(y="foo"))}
-
-    res = resolve_addresses(
-        Address(base="a", name="b", attr="nested"),
-        mapping,
-    )
-
-    compare(res, Nested(y="foo"))
-
-    res = resolve_addresses(
-        Address(base="a", name="b", attr="nested.y"),
-        mapping,
-    )
-
-    compare(res, "foo")
-
-    res = resolve_addresses(
-        Address(base="a", name="b", attr="x"),
-        mapping,
-    )
-
-    compare(res, 1)
-
-    res = resolve_addresses(
-        Address(base="a", name="b", attr="y"),
-        mapping,
-    )
-
-    compare(res, 2.3)
-
-
-def test_resolve_addresses__empty_dict_returns_empty_dict():
-    res = resolve_addresses(
-        {},
-        {Address(base="a", name="b"): 1, Address(base="c", name="d"): "spam"},
-    )
-
-    compare(res, {})
-
-
-def test_resolve_addresses__non_empty_dict_without_addresses_returns_same_dict():
-    res = resolve_addresses(
-        {"foo": 1, "spam": "bar"},
-        {Address(base="a", name="b"): 1, Address(base="c", name="d"): "spam"},
-    )
-
-    compare(res, {"foo": 1, "spam": "bar"})
-
-
-def test_resolve_addresses__replace_addresses_in_dict_with_their_mapped_value():
-    res = resolve_addresses(
-        {
-            "foo": Address(base="a", name="b"),
-            "bar": Address(base="a", name="b"),
-            "spam": Address(base="c", name="d"),
-            "other": 1,
-        },
-        {
-            Address(base="a", name="b"): 11,
-            Address(base="c", name="d"): "spam",
-            Address(base="e", name="f"): "hi",
-        },
-    )
-
-    compare(res, {"foo": 11, "bar": 11, "spam": "spam", "other": 1})
-
-
-def test_resolve_addresses__replace_addresses_in_nested_dicts():
-    res = resolve_addresses(
-        {
-            "foo": Address(base="a", name="b"),
-            "nested": {"bar": Address(base="a", name="b"), "spam": Address(base="c", name="d")},
-            "other": 1,
-        },
-        {
-            Address(base="a", name="b"): 11,
-            Address(base="c", name="d"): "spam",
-            Address(base="e", name="f"): "hi",
-        },
-    )
-
-    compare(res, {"foo": 11, "nested": {"bar": 11, "spam": "spam"}, "other": 1})
-
-
-def test_resolve_addresses__raises_UnresolvableAddress_when_address_in_dict_cannot_be_resolved():
-    with ShouldRaise(UnresolvableAddress) as exc:
-        resolve_addresses(
-            {
-                "foo": Address(base="a", name="b"),
-                "bar": Address(base="a", name="b"),
-                "spam": Address(base="not", name="found"),
-                "other": 1,
-            },
-            {
-                Address(base="a", name="b"): 11,
-                Address(base="c", name="d"): "spam",
-                Address(base="e", name="f"): "hi",
-            },
-        )
+@pytest.mark.parametrize(
+    ["value", "mapping", "expected"],
+    [
+        (ADDR_A_B, MAPPING, 11),
+        (Address(base="a", name="b", attr="x"), MAPPING_DATA, 1),
+        (Address(base="a", name="b", attr="y"), MAPPING_DATA, 2.3),
+        (Address(base="a", name="b", attr="nested"), MAPPING_DATA, Nested(y="foo")),
+        (Address(base="a", name="b", attr="nested.y"), MAPPING_DATA, "foo"),
+        ({}, MAPPING, {}),
+        ({"foo": 1, "spam": "bar"}, MAPPING, {"foo": 1, "spam": "bar"}),
+        (
+            {"foo": ADDR_A_B, "bar": ADDR_A_B, "spam": ADDR_C_D, "other": 1},
+            MAPPING,
+            {"foo": 11, "bar": 11, "spam": "spam", "other": 1},
+        ),
+        (
+            {"foo": ADDR_A_B, "nested": {"bar": ADDR_A_B, "spam": ADDR_C_D}, "other": 1},
+            MAPPING,
+            {"foo": 11, "nested": {"bar": 11, "spam": "spam"}, "other": 1},
+        ),
+        ([], MAPPING, []),
+        (["foo", "bar"], MAPPING, ["foo", "bar"]),
+        (["foo", ADDR_A_B, "spam", ADDR_C_D], MAPPING, ["foo", 11, "spam", "spam"]),
+    ],
+    ids=[
+        "single_address",
+        "address_with_attr",
+        "address_with_other_attr",
+        "address_with_nested_attr",
+        "address_with_attr_of_nested_attr",
+        "empty_dict",
+        "dict_without_addresses",
+        "dict_with_addresses",
+        "nested_dicts_with_addresses",
+        "empty_list",
+        "list_without_addresses",
+        "list_with_addresses",
+    ],
+)
+def test_resolve_addresses__replace_addresses_with_their_mapped_value(value, mapping, expected):
+    res = resolve_addresses(value, mapping)
 
-    compare(exc.raised.address, Address(base="not", name="found"))
+    compare(res, expected)
 
 
-def test_resolve_addresses__raises_UnresolvableAddress_if_address_cannot_resolve_nested_dict():
+@pytest.mark.parametrize(
+    ["value"],
+    [
+        (ADDR_NOT_FOUND,),
+        ({"foo": ADDR_A_B, "bar": ADDR_A_B, "spam": ADDR_NOT_FOUND, "other": 1},),
+        ({"foo": ADDR_A_B, "bar": {"spam": ADDR_NOT_FOUND, "other": 1}},),
+        ([ADDR_A_B, ADDR_NOT_FOUND],),
+    ],
+    ids=["single_address", "dict", "nested_dict", "list"],
+)
+def test_resolve_addresses__raises_UnresolvableAddress_if_address_cannot_be_resolved(value):
     with ShouldRaise(UnresolvableAddress) as exc:
-        resolve_addresses(
-            {
-                "foo": Address(base="a", name="b"),
-                "bar": {
-                    "spam": Address(base="not", name="found"),
-                    "other": 1,
-                },
-            },
-            {
-                Address(base="a", name="b"): 11,
-                Address(base="c", name="d"): "spam",
-            },
-        )
-
-    compare(exc.raised.address, Address(base="not", name="found"))
-
+        resolve_addresses(value, MAPPING)
 
-def test_resolve_addresses__empty_list():
-    res = resolve_addresses(
-        [],
-        {
-            Address(base="a", name="b"): "bar",
-            Address(base="c", name="d"): "other",
-        },
-    )
+    compare(exc.raised.address, ADDR_NOT_FOUND)
 
-    compare(res, [])
 
+def test_resolve_addresses__return_separate_copies_of_shared_nested_dict():
+    shared = {"bar": ADDR_A_B}
 
-def test_resolve_addresses__return_unchanged_list_if_it_does_not_contain_addresses():
-    res = resolve_addresses(
-        [
-            "foo",
-            "bar",
-        ],
-        {
-            Address(base="c", name="d"): "other",
-        },
-    )
+    res = resolve_addresses({"foo": shared, "spam": shared}, MAPPING)
 
-    compare(res, ["foo", "bar"])
-
-
-def test_resolve_addresses__replace_addresses_in_list():
-    res = resolve_addresses(
-        [
-            "foo",
-            Address(base="a", name="b"),
-            "spam",
-            Address(base="c", name="d"),
-        ],
-        {
-            Address(base="a", name="b"): "bar",
-            Address(base="c", name="d"): "other",
-        },
-    )
-
-    compare(res, ["foo", "bar", "spam", "other"])
-
-
-def test_resolve_addresses__raises_UnresolvableAddress_when_address_in_list_cannot_be_resolved():
-    with ShouldRaise(UnresolvableAddress) as exc:
-        resolve_addresses(
-            [
-                Address(base="a", name="b"),
-                Address(base="not", name="found"),
-            ],
-            {
-                Address(base="a", name="b"): 11,
-                Address(base="c", name="d"): "spam",
-            },
-        )
-
-    compare(exc.raised.address, Address(base="not", name="found"))
+    compare(res, {"foo": {"bar": 11}, "spam": {"bar": 11}})
+    compare(res["foo"] is res["spam"], False)
 
 
 class Dummy:
@@ -281,9 +141,7 @@ class Dummy:
 
 @define(frozen=True, kw_only=True)
 class DummyArtifact(Artifact):
-    @classmethod
-    def spec_name(self) -> str:
-        return "dummy_artifact"
+    spec_name = "dummy_artifact"
 
     def resolve(self, ctx: Context) -> Optional[Dummy]:
         return Dummy()
@@ -296,9 +154,7 @@ class DummyResource:
 
 @define(frozen=True, kw_only=True)
 class DummyResourceSpec(Resource):
-    @classmethod
-    def spec_name(self) -> str:
-        return "dummy_resource"
+    spec_name = "dummy_resource"
 
     def state(self, ctx: Context) -> Optional[DummyResource]:
         return DummyResource()
@@ -310,9 +166,7 @@ class DummyStep(Step):
     artifact: DummyArtifact
     resource: Optional[DummyResourceSpec] = None
 
-    @classmethod
-    def spec_name(self) -> str:
-        return "dummy_step"
+    spec_name = "dummy_step"
 
     def snapshot(self, ctx: "Context") -> None:
         return None
@@ -329,9 +183,7 @@ class DummyCheck(Check):
 
     resource: DummyResourceSpec
 
-    @classmethod
-    def spec_name(self) -> str:
-        return "dummy_check"
+    spec_name = "dummy_check"
 
     def check(self, ctx: Context):
         pass
@@ -339,7 +191,7 @@ class DummyCheck(Check):
 
 def test_generate_plan__empty_strategy_generates_empty_plan(treb_context):
     strategy = Strategy(ctx=treb_context)
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     res = generate_plan(
         strategy,
@@ -353,7 +205,7 @@ def test_generate_plan__strategy_with_single_artifact_generates_empty_plan(treb_
     strategy = Strategy(ctx=treb_context)
     strategy.register_artifact("root", DummyArtifact(name="artifact"))
 
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     res = generate_plan(
         strategy,
@@ -368,7 +220,7 @@ def test_generate_plan__strategy_with_step_generates_single_action(treb_context)
     strategy.register_artifact("root", DummyArtifact(name="artifact"))
     strategy.register_step("root", DummyStep(name="step", artifact="//root:artifact"))
 
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     res = generate_plan(
         strategy,
@@ -391,7 +243,7 @@ def test_generate_plan__strategy_with_two_indipendent_steps_generates_two_action
     strategy.register_step("root", DummyStep(name="step-foo", artifact="//root:artifact"))
     strategy.register_step("root", DummyStep(name="step-bar", artifact="//root:artifact"))
 
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     res = generate_plan(
         strategy,
@@ -420,7 +272,7 @@ def test_generate_plan__strategy_with_dependent_steps_generates_all_actions_in_o
         "root", DummyStep(name="step-two", artifact="//root:artifact", after=["//root:step-one"])
     )
 
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     res = generate_plan(
         strategy,
@@ -455,7 +307,7 @@ def test_generate_plan__can_generate_actions_for_all_specs(treb_context):
     strategy.register_resource("root", DummyResourceSpec(name="resource"))
     strategy.register_artifact("root", DummyArtifact(name="artifact"))
 
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     res = generate_plan(
         strategy,
@@ -482,7 +334,7 @@ def test_generate_plan__can_generate_plan_for_diamond_shaped_dependencies(treb_c
         "root", DummyCheck(name="check", resource="//root:step-foo", after=["//root:step-bar"])
     )
 
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     res = generate_plan(
         strategy,
@@ -511,7 +363,7 @@ def test_generate_plan__raise_AddressNotFound_if_nodes_use_unknown_addresses(tre
         "root", DummyCheck(name="check", resource=Address(base="root", name="impossible"))
     )
 
-    available_artifacts = list(strategy.artifacts().keys())
+    available_artifacts = list(strategy.artifacts())
 
     with ShouldRaise(UnknownAddresses) as exc:
         generate_plan(
@@ -559,3 +411,167 @@ def test_generate_plan__skip_unreachable_steps(treb_context):
             ]
         ),
     )
+
+
+def test_generate_plan__skip_steps_depending_on_unreachable_steps(treb_context):
+    strategy = Strategy(ctx=treb_context)
+    strategy.register_artifact("root", DummyArtifact(name="artifact-exists"))
+    strategy.register_artifact("root", DummyArtifact(name="artifact-does-not-exist"))
+    strategy.register_step(
+        "root",
+        DummyStep(
+            name="step-unreachable", artifact=Address(base="root", name="artifact-does-not-exist")
+        ),
+    )
+    strategy.register_step(
+        "root",
+        DummyStep(
+            name="step-after-unreachable",
+            artifact=Address(base="root", name="artifact-exists"),
+            after=["//root:step-unreachable"],
+        ),
+    )
+    strategy.register_check(
+        "root",
+        DummyCheck(
+            name="check-unreachable", resource=Address(base="root", name="step-unreachable")
+        ),
+    )
+    strategy.register_step(
+        "root",
+        DummyStep(name="step-reachable", artifact=Address(base="root", name="artifact-exists")),
+    )
+
+    res = generate_plan(
+        strategy,
+        [Address(base="root", name="artifact-exists")],
+    )
+
+    compare(
+        res,
+        Plan(
+            actions=[
+                Action(type=ActionType.RUN, address=Address(base="root", name="step-reachable")),
+            ]
+        ),
+    )
+
+
+def test_generate_plan__raise_UnknownAddresses_if_skipped_step_uses_unknown_addresses(treb_context):
+    strategy = Strategy(ctx=treb_context)
+    strategy.register_artifact("root", DummyArtifact(name="artifact-does-not-exist"))
+    strategy.register_step(
+        "root",
+        DummyStep(
+            name="step",
+            artifact=Address(base="root", name="artifact-does-not-exist"),
+            resource=Address(base="root", name="not-found"),
+        ),
+    )
+
+    with ShouldRaise(UnknownAddresses) as exc:
+        generate_plan(strategy, [])
+
+    compare(exc.raised.addresses, [Address(base="root", name="not-found")])
+
+
+def test_generate_plan__raise_UnknownAddresses_for_cycle_next_to_skipped_artifact(treb_context):
+    strategy = Strategy(ctx=treb_context)
+    strategy.register_artifact("a/b", DummyArtifact(name="art0"))
+    strategy.register_step(
+        "a/b",
+        DummyStep(
+            name="sf0",
+            artifact=Address(base="a/b", name="sg2"),
+            resource=Address(base="a/b", name="art0"),
+        ),
+    )
+    strategy.register_step(
+        "a/b",
+        DummyStep(
+            name="sg2",
+            artifact=Address(base="a/b", name="sg2"),
+            resource=Address(base="a/b", name="sf0"),
+        ),
+    )
+
+    with ShouldRaise(UnknownAddresses) as exc:
+        generate_plan(strategy, [])
+
+    compare(
+        exc.raised.addresses,
+        [Address(base="a/b", name="sg2"), Address(base="a/b", name="sg2")],
+    )
+
+
+def test_generate_plan__raise_UnknownAddresses_if_step_runs_after_unknown_address(treb_context):
+    strategy = Strategy(ctx=treb_context)
+    strategy.register_artifact("root", DummyArtifact(name="artifact"))
+    strategy.register_step(
+        "root",
+        DummyStep(
+            name="step",
+            artifact=Address(base="root", name="artifact"),
+            after=["//root:not-found"],
+        ),
+    )
+
+    with ShouldRaise(UnknownAddresses) as exc:
+        generate_plan(strategy, [Address(base="root", name="artifact")])
+
+    compare(exc.raised.addresses, [Address(base="root", name="not-found")])
+
+
+def test_generate_plan__raise_UnknownAddresses_if_step_runs_after_cycle(treb_context):
+    strategy = Strategy(ctx=treb_context)
+    strategy.register_artifact("root", DummyArtifact(name="artifact"))
+    strategy.register_step(
+        "root",
+        DummyStep(
+            name="step-a",
+            artifact=Address(base="root", name="artifact"),
+            after=["//root:step-b"],
+        ),
+    )
+    strategy.register_step(
+        "root",
+        DummyStep(
+            name="step-b",
+            artifact=Address(base="root", name="artifact"),
+            after=["//root:step-a"],
+        ),
+    )
+    strategy.register_step(
+        "root",
+        DummyStep(
+            name="step-c",
+            artifact=Address(base="root", name="artifact"),
+            after=["//root:step-a"],
+        ),
+    )
+
+    with ShouldRaise(UnknownAddresses) as exc:
+        generate_plan(strategy, [Address(base="root", name="artifact")])
+
+    compare(
+        exc.raised.addresses,
+        [
+            Address(base="root", name="step-b"),
+            Address(base="root", name="step-a"),
+            Address(base="root", name="step-a"),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    ["value", "expected"],
+    [
+        (None, False),
+        ("//foo:bar", False),
+        ([1, "a", {"b": None}], False),
+        (ADDR_A_B, True),
+        ({"a": [1, {"b": ADDR_C_D}]}, True),
+    ],
+)
+def test_has_addresses__finds_nested_addresses(value, expected):
+    compare(has_addresses(value), expected)
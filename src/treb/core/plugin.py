@@ -1,8 +1,9 @@
 """Helpers used to add step and artifact specs to treb."""
+from functools import lru_cache
 from importlib import import_module
-from typing import List, cast
+from typing import Tuple, Type
 
-from attrs import define
+from attrs import define, field
 
 from treb.core.artifact import Artifact
 from treb.core.check import Check
@@ -11,44 +12,59 @@ from treb.core.spec import Spec
 from treb.core.step import Step
 
 
-@define(frozen=True, kw_only=True)
+@define(frozen=True, kw_only=True, slots=True, weakref_slot=False)
 class Plugin:
-    """A treb plugin that provides step and artifact specs."""
+    """A treb plugin that provides step and artifact specs.
+
+    Arguments:
+        namespace: the plugin's namespace.
+        steps: the steps defined in this plug-in.
+        artifacts: the artifacts defined in this plug-in.
+        resources: the resources defined in this plug-in.
+        checks: the checks defined in this plug-in.
+    """
 
     namespace: str
-    steps: List[Step]
-    artifacts: List[Artifact]
-    resources: List[Resource]
-    checks: List[Check]
+    steps: Tuple[Type[Step], ...] = field(default=(), converter=tuple)
+    artifacts: Tuple[Type[Artifact], ...] = field(default=(), converter=tuple)
+    resources: Tuple[Type[Resource], ...] = field(default=(), converter=tuple)
+    checks: Tuple[Type[Check], ...] = field(default=(), converter=tuple)
+    _specs: Tuple[Type[Spec], ...] = field(init=False, eq=False, repr=False)
 
-    def specs(self) -> List[Spec]:
-        """Gets all the spec defined in this plug-in."""
-        artifacts: List[Spec] = cast(List[Spec], self.artifacts)
-        checks: List[Spec] = cast(List[Spec], self.checks)
-        resources: List[Spec] = cast(List[Spec], self.resources)
-        steps: List[Spec] = cast(List[Spec], self.steps)
+    def __attrs_post_init__(self):
+        # the plug-in is frozen, so all of its specs are gathered only once.
+        object.__setattr__(
+            self,
+            "_specs",
+            (*self.artifacts, *self.checks, *self.resources, *self.steps),
+        )
 
-        return artifacts + checks + resources + steps
+    def specs(self) -> Tuple[Type[Spec], ...]:
+        """Gets all the spec defined in this plug-in."""
+        return self._specs
 
 
+@lru_cache(maxsize=None)
 def load_plugin(module: str) -> Plugin:
     """Loads a plugin that exposes step and artifact specs in a submodule
     `register`.
 
+    The plugin is loaded only once per module and reused on the following calls.
+
     Arguments:
         module: import path of the plugin.
     """
     register = import_module(f"{module}.register")
 
-    steps: List[Step] = cast(List[Step], getattr(register, "steps", lambda: [])())
-    artifacts: List[Artifact] = cast(List[Artifact], getattr(register, "artifacts", lambda: [])())
-    checks: List[Check] = cast(List[Check], getattr(register, "checks", lambda: [])())
-    resources: List[Resource] = cast(List[Resource], getattr(register, "resources", lambda: [])())
+    get_steps = getattr(register, "steps", None)
+    get_artifacts = getattr(register, "artifacts", None)
+    get_checks = getattr(register, "checks", None)
+    get_resources = getattr(register, "resources", None)
 
     return Plugin(
         namespace=register.namespace(),
-        artifacts=artifacts,
-        checks=checks,
-        resources=resources,
-        steps=steps,
+        artifacts=() if get_artifacts is None else get_artifacts(),
+        checks=() if get_checks is None else get_checks(),
+        resources=() if get_resources is None else get_resources(),
+        steps=() if get_steps is None else get_steps(),
     )
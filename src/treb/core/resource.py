@@ -14,7 +14,7 @@ if TYPE_CHECKING:
 StateT = TypeVar("StateT")
 
 
-@define(frozen=True, kw_only=True)
+@define(frozen=True, kw_only=True, slots=True)
 class Resource(Generic[StateT], Spec):
     """Base class for all resource specs supported by treb."""
 
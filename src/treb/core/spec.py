@@ -1,25 +1,60 @@
 """Base class for all the specs used to define a deploy strategy."""
-import abc
-from typing import List
+from typing import ClassVar, List
 
 from attrs import define, field
 
 
-@define(frozen=True, kw_only=True)
-class Spec(abc.ABC):
+class Abstract(type):
+    """Metaclass that prevents the instantiation of classes with abstract
+    methods, like `abc.ABCMeta` does.
+
+    Unlike `abc.ABCMeta`, it does not support virtual subclasses so
+    `isinstance` and `issubclass` use the built-in checks instead of
+    going through the ABC registry and caches.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        new_cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+
+        abstracts = {
+            key for key, value in namespace.items() if getattr(value, "__isabstractmethod__", False)
+        }
+
+        for base in bases:
+            for key in getattr(base, "__abstractmethods__", ()):
+                if getattr(getattr(new_cls, key, None), "__isabstractmethod__", False):
+                    abstracts.add(key)
+
+        new_cls.__abstractmethods__ = frozenset(abstracts)
+
+        return new_cls
+
+
+@define(frozen=True, kw_only=True, slots=True)
+class Spec(metaclass=Abstract):
     """Base class to be used for all steps.
 
+    Class attributes:
+        spec_name: the name used to reference this type of spec in deploy files.
+
     Arguments:
         name: identify a step within a deploy file.
         after: perform this spec only after all the specs in the list
             have been executed.
     """
 
+    spec_name: ClassVar[str]
+
     name: str
     after: List[str] = field(factory=list)
 
-    @classmethod
-    @abc.abstractmethod
-    def spec_name(cls) -> str:
-        """Returns the name of this type of artifacts."""
-        raise NotImplementedError
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # abstract specs (i.e. `Step`) are not registered so they do not need a name.
+        is_abstract = any(
+            getattr(getattr(cls, attr, None), "__isabstractmethod__", False) for attr in dir(cls)
+        )
+
+        if not is_abstract and not isinstance(getattr(cls, "spec_name", None), str):
+            raise TypeError(f"spec {cls.__name__} must define the class attribute spec_name")
@@ -1,6 +1,7 @@
 """Manages the state persisted in Git."""
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -12,6 +13,24 @@ from treb.core.context import Context
 from treb.core.plan import Plan
 
 
+@lru_cache(maxsize=128)
+def _base_path(repo_path: str, base_path: Optional[str]) -> Path:
+    if base_path is None:
+        return Path(repo_path)
+
+    return Path(repo_path).joinpath(base_path)
+
+
+@lru_cache(maxsize=128)
+def _revisions_path(repo_path: str, base_path: Optional[str]) -> Path:
+    return _base_path(repo_path, base_path).joinpath("revisions")
+
+
+@lru_cache(maxsize=128)
+def _revision_path(repo_path: str, base_path: Optional[str], revision: str) -> Path:
+    return _revisions_path(repo_path, base_path).joinpath(revision)
+
+
 def get_base_path(ctx: Context) -> Path:
     """Gets the path to the state repository.
 
@@ -21,10 +40,7 @@ def get_base_path(ctx: Context) -> Path:
     Returns:
         Path to the state repository.
     """
-    if ctx.config.state.base_path is None:
-        return Path(ctx.config.state.repo_path)
-
-    return Path(ctx.config.state.repo_path).joinpath(ctx.config.state.base_path)
+    return _base_path(ctx.config.state.repo_path, ctx.config.state.base_path)
 
 
 def get_revisions_path(ctx: Context) -> Path:
@@ -36,9 +52,7 @@ def get_revisions_path(ctx: Context) -> Path:
     Returns:
         Path to the revisions directory.
     """
-    base_path = get_base_path(ctx)
-
-    return base_path.joinpath("revisions")
+    return _revisions_path(ctx.config.state.repo_path, ctx.config.state.base_path)
 
 
 def get_revision_path(ctx: Context) -> Path:
@@ -51,9 +65,7 @@ def get_revision_path(ctx: Context) -> Path:
     Returns:
         Path to a revision directory.
     """
-    rev_path = get_revisions_path(ctx)
-
-    return rev_path.joinpath(ctx.revision)
+    return _revision_path(ctx.config.state.repo_path, ctx.config.state.base_path, ctx.revision)
 
 
 def init_state(ctx: Context):
@@ -106,7 +118,7 @@ def save_revision(ctx: Context, plan: Plan):
 
     with open(state_path, "w", encoding="utf-8") as plan_file:
         encoded = unstructure(revision)
-        plan_file.write(json.dumps(encoded, indent=4, sort_keys=True))
+        json.dump(encoded, plan_file, indent=4, sort_keys=True)
 
     git.commit(path=ctx.config.state.repo_path, message=f"update state for revision {ctx.revision}")
 
@@ -128,9 +140,9 @@ def load_revision(ctx: Context) -> Optional[Revision]:
 
     try:
         with open(state_path, encoding="utf-8") as plan_file:
-            decoded = json.loads(plan_file.read())
-
-            return structure(decoded, Revision)
+            decoded = json.load(plan_file)
 
     except FileNotFoundError:
         return None
+
+    return structure(decoded, Revision)
@@ -6,9 +6,10 @@ import pytest
 from attrs import evolve
 from testfixtures import compare
 
+from treb.core.address import Address
 from treb.core.config import Config, ProjectConfig, StateConfig
 from treb.core.context import Context
-from treb.core.plan import Plan
+from treb.core.plan import Action, ActionState, ActionType, Plan
 from treb.core.state import (
     Revision,
     get_base_path,
@@ -131,6 +132,50 @@ def test_save_revision__persist_revision_state(git, treb_context):
     compare(rev, Revision(plan=plan))
 
 
+@mock.patch("treb.core.state.git")
+def test_save_revision__load_same_revision_with_actions(git, treb_context):
+    plan = Plan(
+        actions=[
+            Action(
+                type=ActionType.RUN,
+                address=Address(base="foo", name="step"),
+                state=ActionState.DONE,
+                snapshot={"image": "foo:abc"},
+                result={"image": "foo:def"},
+            ),
+            Action(
+                type=ActionType.CHECK,
+                address=Address(base="foo", name="check"),
+                state=ActionState.PLANNED,
+            ),
+        ]
+    )
+
+    init_state(treb_context)
+    init_revision(treb_context)
+
+    save_revision(treb_context, plan)
+
+    res = load_revision(treb_context)
+
+    compare(res, Revision(plan=plan))
+
+
+@mock.patch("treb.core.state.git")
+def test_save_revision__write_indented_state_with_sorted_keys(git, treb_context):
+    init_state(treb_context)
+    init_revision(treb_context)
+
+    save_revision(treb_context, Plan(actions=[]))
+
+    rev_state_path = Path(treb_context.config.state.repo_path) / "revisions" / "abc" / "state.json"
+
+    compare(
+        rev_state_path.read_text(encoding="utf-8"),
+        '{\n    "plan": {\n        "actions": []\n    }\n}',
+    )
+
+
 @mock.patch("treb.core.state.git")
 def test_save_revision__do_not_push(git, treb_context):
     treb_context = evolve(
@@ -1,10 +1,10 @@
 """Rules for planning and executing a treb deploy strategy."""
-import copy
 import os
-from collections import defaultdict
-from functools import partial
+import sys
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, Generic, TypeVar
+from types import CodeType, MappingProxyType
+from typing import Any, Dict, Mapping, Tuple, TypeVar
 
 from attrs import define, fields
 
@@ -13,24 +13,11 @@ from treb.core.artifact import Artifact
 from treb.core.check import Check
 from treb.core.context import Context
 from treb.core.deploy import Vars, discover_deploy_files
+from treb.core.plan import has_addresses, iter_addresses
 from treb.core.resource import Resource
 from treb.core.spec import Spec
 from treb.core.step import Step
-
-ItemT = TypeVar("ItemT", Artifact, Step, Check, Resource)
-
-
-@define(frozen=True, kw_only=True)
-class Node(Generic[ItemT]):
-    """Represents a node in the strategy graph.
-
-    Arguments:
-        address: the node address.
-        item: the actual node that can be wither a step or an artifact.
-    """
-
-    address: Address
-    item: ItemT
+from treb.utils import memoize
 
 
 def is_addressable_type(type_) -> bool:
@@ -83,9 +70,36 @@ def istype(cls, type_):
         return False
 
 
+@memoize
+def _dependency_fields(cls) -> Tuple[str, ...]:
+    # the fields of an attrs class never change after its definition so they
+    # are computed only once per spec class. The name only identifies the spec
+    # and it is never a dependency.
+    return tuple(field.name for field in fields(cls) if field.name != "name")
+
+
+@lru_cache(maxsize=512)
+def _compile_deploy_file(path: str, code: str) -> CodeType:
+    # the source is part of the key, so an edited deploy file is compiled again
+    # while unchanged ones reuse the code object.
+    return compile(code, path, "exec", dont_inherit=True)
+
+
+_NO_FIELDS: Mapping[str, Any] = MappingProxyType({})
+
 ArgT = TypeVar("ArgT")
 
 
+@define(frozen=True, kw_only=True, slots=True, weakref_slot=False)
+class _Dependencies:
+    # everything the strategy knows about the dependencies of a step or check,
+    # indexed once when the spec is registered.
+    fields: Dict[str, Any]
+    address_fields: Mapping[str, Any]
+    addresses: Tuple[Address, ...]
+    after: Tuple[Address, ...]
+
+
 class Strategy:
     """Describes the deploy strategy for a project.
 
@@ -93,47 +107,93 @@ class Strategy:
         ctx: the context where to execute the deploy strategy.
     """
 
+    __slots__ = (
+        "_ctx",
+        "_specs",
+        "_steps",
+        "_artifacts",
+        "_resources",
+        "_dependencies",
+    )
+
     def __init__(self, ctx: Context):
         self._ctx = ctx
-        self._steps: Dict[Address, Node[Step] | Node[Check]] = {}
-        self._artifacts: Dict[Address, Node[Artifact]] = {}
-        self._resources: Dict[Address, Node[Resource]] = {}
-        self._rev_graph: Dict[Address, Any] = defaultdict(dict)
+        self._specs: Dict[Address, Spec] = {}
+        self._steps: Dict[Address, Step | Check] = {}
+        self._artifacts: Dict[Address, Artifact] = {}
+        self._resources: Dict[Address, Resource] = {}
+        self._dependencies: Dict[Address, _Dependencies] = {}
 
     def ctx(self) -> Context:
         """Gets the context where to execute the deploy strategy."""
         return self._ctx
 
-    def specs(self) -> Dict[Address, Spec]:
-        """Returns a mapping of addresses to all specs defined in the
+    def specs(self) -> Mapping[Address, Spec]:
+        """Returns a read-only mapping of addresses to all specs defined in the
         deployment strategy."""
-        return self.steps() | self.artifacts() | self.resources()
+        return MappingProxyType(self._specs)
 
-    def steps(self) -> Dict[Address, Step | Check]:
-        """Returns a mapping of addresses to all steps defined in the
+    def steps(self) -> Mapping[Address, Step | Check]:
+        """Returns a read-only mapping of addresses to all steps defined in the
         deployment strategy."""
-        return {addr: node.item for addr, node in self._steps.items()}
+        return MappingProxyType(self._steps)
 
-    def artifacts(self) -> Dict[Address, Artifact]:
-        """Returns a mapping of addresses to all artifacts defined in the
-        deployment strategy."""
-        return {addr: node.item for addr, node in self._artifacts.items()}
+    def artifacts(self) -> Mapping[Address, Artifact]:
+        """Returns a read-only mapping of addresses to all artifacts defined in
+        the deployment strategy."""
+        return MappingProxyType(self._artifacts)
 
-    def resources(self) -> Dict[Address, Resource]:
-        """Returns a mapping of addresses to all resources defined in the
-        deployment strategy."""
-        return {addr: node.item for addr, node in self._resources.items()}
+    def resources(self) -> Mapping[Address, Resource]:
+        """Returns a read-only mapping of addresses to all resources defined in
+        the deployment strategy."""
+        return MappingProxyType(self._resources)
 
     def dependencies(self, address):
         """Returns all the dependencies of the given address."""
-        deps = copy.deepcopy(self._rev_graph[address])
+        deps = self._dependencies.get(address)
+
+        if deps is None:
+            return {}
+
+        # the values are shared with the spec, which is frozen, so only the
+        # mapping is copied.
+        return dict(deps.fields)
+
+    def dependency_addresses(self, address: Address) -> Tuple[Address, ...]:
+        """Returns the distinct addresses the given address depends on, in the
+        order they are found in its spec."""
+        deps = self._dependencies.get(address)
+
+        return () if deps is None else deps.addresses
+
+    def after_addresses(self, address: Address) -> Tuple[Address, ...]:
+        """Returns the addresses of the steps that must be completed before the
+        given address, as listed in its `after` field."""
+        deps = self._dependencies.get(address)
 
-        try:
-            deps.pop("name")
-        except KeyError:
-            pass
+        return () if deps is None else deps.after
 
-        return deps
+    def address_fields(self, address: Address) -> Mapping[str, Any]:
+        """Returns a read-only mapping with only the dependencies of the given
+        address that refer to other addresses.
+
+        The other fields resolve to themselves, so they can be skipped when
+        resolving the dependencies of a step before running it.
+        """
+        deps = self._dependencies.get(address)
+
+        return _NO_FIELDS if deps is None else deps.address_fields
+
+    def _index_dependencies(self, address: Address, spec: Step | Check):
+        deps = {name: getattr(spec, name) for name in _dependency_fields(type(spec))}
+        address_fields = {name: value for name, value in deps.items() if has_addresses(value)}
+
+        self._dependencies[address] = _Dependencies(
+            fields=deps,
+            address_fields=MappingProxyType(address_fields),
+            addresses=tuple(dict.fromkeys(iter_addresses(address_fields))),
+            after=tuple(Address.from_string(address.base, after) for after in deps["after"]),
+        )
 
     def register_artifact(self, path: str, artifact: Artifact):
         """Adds an artifact to the deploy strategy.
@@ -142,11 +202,10 @@ class Strategy:
             path: the base path to the artifact definition.
             artifact: the artifact spec to add.
         """
-        node = Node[Artifact](
-            address=Address(base=path, name=artifact.name),
-            item=artifact,
-        )
-        self._artifacts[node.address] = node
+        address = Address(base=path, name=artifact.name)
+
+        self._artifacts[address] = artifact
+        self._specs[address] = artifact
 
     def register_resource(self, path: str, resource: Resource):
         """Adds a resource to the deploy strategy.
@@ -155,11 +214,10 @@ class Strategy:
             path: the base path to the resource definition.
             resource: the resource spec to add.
         """
-        node = Node[Resource](
-            address=Address(base=path, name=resource.name),
-            item=resource,
-        )
-        self._resources[node.address] = node
+        address = Address(base=path, name=resource.name)
+
+        self._resources[address] = resource
+        self._specs[address] = resource
 
     def register_step(self, path: str, step: Step):
         """Adds a step to the deploy strategy.
@@ -170,15 +228,10 @@ class Strategy:
         """
         address = Address(base=path, name=step.name)
 
-        node = Node[Step](
-            address=address,
-            item=step,
-        )
-
-        self._steps[address] = node
+        self._steps[address] = step
+        self._specs[address] = step
 
-        for field in fields(type(step)):
-            self._rev_graph[node.address][field.name] = getattr(step, field.name)
+        self._index_dependencies(address, step)
 
     def register_check(self, path: str, check: Check):
         """Adds a check to the deploy strategy.
@@ -189,15 +242,10 @@ class Strategy:
         """
         address = Address(base=path, name=check.name)
 
-        node = Node[Check](
-            address=address,
-            item=check,
-        )
-
-        self._steps[address] = node
+        self._steps[address] = check
+        self._specs[address] = check
 
-        for field in fields(type(check)):
-            self._rev_graph[node.address][field.name] = getattr(check, field.name)
+        self._index_dependencies(address, check)
 
 
 def prepare_strategy(ctx: Context) -> Strategy:
@@ -211,29 +259,42 @@ def prepare_strategy(ctx: Context) -> Strategy:
     """
     strategy = Strategy(ctx)
 
-    def _register(base, cls):
-        def _wrapper(*args, **kwargs):
-            item = cls(*args, **kwargs)
+    # base path of the deploy file being executed, the wrappers below read it
+    # when called so they can be shared by all the deploy files.
+    base = ""
+
+    def _register(cls):
+        # the registration method depends only on the spec class, so it is
+        # picked once here instead of on every instantiation in the deploy files.
+        if issubclass(cls, Step):
+            register = strategy.register_step
 
-            if issubclass(cls, Step):
-                strategy.register_step(base, item)
+        elif issubclass(cls, Artifact):
+            register = strategy.register_artifact
 
-            elif issubclass(cls, Artifact):
-                strategy.register_artifact(base, item)
+        elif issubclass(cls, Check):
+            register = strategy.register_check
 
-            elif issubclass(cls, Check):
-                strategy.register_check(base, item)
+        elif issubclass(cls, Resource):
+            register = strategy.register_resource
 
-            elif issubclass(cls, Resource):
-                strategy.register_resource(base, item)
+        else:
+            register = None
 
-            else:
+        def _wrapper(*args, **kwargs):
+            item = cls(*args, **kwargs)
+
+            if register is None:
                 raise TypeError(f"cannot register item of type {cls.__name__}")
 
+            register(base, item)
+
             return item
 
         return _wrapper
 
+    specs = {key: _register(value) for key, value in ctx.specs.items()}
+
     for deploy_file in discover_deploy_files(
         root=ctx.config.project.repo_path, deploy_filename=ctx.config.deploy_filename
     ):
@@ -241,8 +302,8 @@ def prepare_strategy(ctx: Context) -> Strategy:
             ctx.config.project.repo_path
         )
 
-        base = "" if base_path == Path() else str(base_path)
-        specs = {key: _register(base, value) for key, value in ctx.specs.items()}
+        # all the addresses defined in the same deploy file share the base string
+        base = sys.intern("" if base_path == Path() else str(base_path))
 
         exec_globals: Dict[str, Any] = {
             "var": Vars(ctx.config.vars),
@@ -251,7 +312,7 @@ def prepare_strategy(ctx: Context) -> Strategy:
         }
 
         exec(  # nosec[B102:exec_used] pylint: disable=exec-used
-            deploy_file.code,
+            _compile_deploy_file(deploy_file.path, deploy_file.code),
             exec_globals,
         )
 
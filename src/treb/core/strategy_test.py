@@ -22,9 +22,7 @@ class Dummy:
 
 @define(frozen=True, kw_only=True)
 class ArtifactTestSpec(Artifact):
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_artifact"
+    spec_name = "test_artifact"
 
     def resolve(self, ctx: Context) -> Dummy:
         return Dummy()
@@ -38,9 +36,7 @@ class ResourceTest:
 
 @define(frozen=True, kw_only=True)
 class ResourceTestSpec(Resource):
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_resource"
+    spec_name = "test_resource"
 
     def state(self, ctx: Context) -> typing.Optional[ResourceTest]:
         return ResourceTest(foo="bar")
@@ -52,9 +48,7 @@ class StepTest(Step):
     artifact: ArtifactTestSpec
     resource: ResourceTestSpec
 
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_step"
+    spec_name = "test_step"
 
     def snapshot(self, ctx: "Context") -> None:
         return None
@@ -72,9 +66,7 @@ class CheckTest(Check):
     resource: ResourceTestSpec
     fail: bool = False
 
-    @classmethod
-    def spec_name(self) -> str:
-        return "test_check"
+    spec_name = "test_check"
 
     def check(self, ctx: Context) -> dict:
         if self.fail:
@@ -131,6 +123,12 @@ def test_is_addressable_type__returns_true_for_check():
     compare(res, True)
 
 
+def test_is_addressable_type__returns_false_for_unhashable_annotation():
+    res = is_addressable_type(typing.Annotated[int, {"a": 1}])
+
+    compare(res, False)
+
+
 @pytest.mark.parametrize(
     ["obj"],
     [
@@ -179,6 +177,9 @@ def test_make_address__raises_ValueError_if_address_is_invalid():
         (typing.List[str],),
         (11,),
         ("string",),
+        ({},),
+        ([1],),
+        (typing.Annotated[int, {}],),
     ],
 )
 def test_istype__returns_false_if_argument_is_not_a_class(arg):
@@ -206,6 +207,12 @@ def test_istype__behave_same_as_subclass(cls, class_or_tuple):
     compare(res, expected)
 
 
+def test_istype__returns_false_if_type_is_not_a_class():
+    res = istype(int, 5)
+
+    compare(res, False)
+
+
 def test_prepare_strategy__no_deploy_file_return_empty_strategy(treb_context):
     res = prepare_strategy(treb_context)
 
@@ -276,3 +283,37 @@ def test_Strategy_dependencies__returns_spec_dependencies(treb_context):
         strategy.dependencies(Address(base="root", name="check")),
         {"resource": Address(base="root", name="resource"), "after": [], "fail": False},
     )
+
+
+def test_Strategy_dependency_addresses__returns_distinct_addresses(treb_context):
+    strategy = Strategy(treb_context)
+
+    strategy.register_artifact("root", ArtifactTestSpec(name="artifact"))
+    strategy.register_step(
+        "root",
+        StepTest(
+            name="step",
+            artifact=Address(base="root", name="artifact"),
+            resource=Address(base="root", name="artifact"),
+        ),
+    )
+
+    compare(strategy.dependency_addresses(Address(base="root", name="artifact")), ())
+    compare(
+        strategy.dependency_addresses(Address(base="root", name="step")),
+        (Address(base="root", name="artifact"),),
+    )
+
+
+def test_Strategy_address_fields__returns_only_fields_with_addresses(treb_context):
+    strategy = Strategy(treb_context)
+
+    strategy.register_check(
+        "root", CheckTest(name="check", resource=Address(base="root", name="resource"))
+    )
+
+    compare(strategy.address_fields(Address(base="root", name="resource")), {})
+    compare(
+        dict(strategy.address_fields(Address(base="root", name="check"))),
+        {"resource": Address(base="root", name="resource")},
+    )
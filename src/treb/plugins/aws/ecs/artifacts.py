@@ -36,9 +36,7 @@ class EcsTaskDefinitionSpec(Artifact):
 
     family: str
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "aws_ecs_task_definition"
+    spec_name = "aws_ecs_task_definition"
 
     def resolve(self, ctx: Context) -> Optional[EcsTaskDefinition]:
         paginator = ECS_CLIENT.get_paginator("list_task_definitions")
@@ -36,9 +36,7 @@ class EcsServiceSpec(Resource):
         image_name: the name of the image without the tag.
     """
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "aws_ecs_service"
+    spec_name = "aws_ecs_service"
 
     cluster: str
     service_name: str
@@ -37,9 +37,7 @@ class RegisterTaskDefinition(Step):
     task_definition: EcsTaskDefinition
     containers: Mapping[str, DockerImage]
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "aws_ecs_create_task_revision"
+    spec_name = "aws_ecs_create_task_revision"
 
     def snapshot(self, ctx: "Context") -> None:
         return None
@@ -92,9 +90,7 @@ class UpdateEcsService(Step):
     ecs_service: EcsService
     task_definition: EcsTaskDefinition
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "aws_ecs_update"
+    spec_name = "aws_ecs_update"
 
     def snapshot(self, ctx: "Context") -> Optional[EcsServiceSnapshot]:
         return EcsServiceSnapshot(
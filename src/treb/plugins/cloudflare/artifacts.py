@@ -38,9 +38,7 @@ class PagesDeploymentSpec(Artifact):
         project: the Pages project's name.
     """
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "cloudflare_pages_deployment"
+    spec_name = "cloudflare_pages_deployment"
 
     account_id: str
     project_name: str
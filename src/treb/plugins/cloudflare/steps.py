@@ -84,9 +84,7 @@ class CloudflareUpdateDns(Step):
         record: the new DNS record.
     """
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "cloudflare_update_dns"
+    spec_name = "cloudflare_update_dns"
 
     zone_id: str
     record: DnsRecordData
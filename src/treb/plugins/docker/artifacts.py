@@ -6,13 +6,11 @@ from attrs import define
 
 from treb.core.artifact import Artifact
 from treb.core.context import Context
-from treb.plugins.docker.utils import full_tag
+from treb.plugins.docker.utils import consume_stream, full_tag, get_client
 from treb.utils import log, print_waiting
 
-CLIENT = docker.from_env()
 
-
-@define(frozen=True, kw_only=True)
+@define(frozen=True, kw_only=True, slots=True)
 class DockerImage:
     """An artifact representing a tagged and existing Docker iamge."""
 
@@ -20,7 +18,7 @@ class DockerImage:
     tag: str
 
 
-@define(frozen=True, kw_only=True)
+@define(frozen=True, kw_only=True, slots=True)
 class DockerImageSpec(Artifact):
     """An artifact spec used to reference a Docker image on a repository.
 
@@ -31,16 +29,14 @@ class DockerImageSpec(Artifact):
     image_name: str
     tag_prefix: str = ""
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "docker_image"
+    spec_name = "docker_image"
 
     def exists(self, ctx: Context) -> bool:
         tag = full_tag(self.image_name, self.tag_prefix, ctx.revision)
 
         with print_waiting("checking registry data"):
             try:
-                CLIENT.images.get_registry_data(tag)
+                get_client().images.get_registry_data(tag)
 
             except docker.errors.NotFound:
                 return False
@@ -51,7 +47,7 @@ class DockerImageSpec(Artifact):
         tag = full_tag(self.image_name, self.tag_prefix, ctx.revision)
 
         with print_waiting("pulling docker image"):
-            CLIENT.images.pull(tag)
+            consume_stream(get_client().api.pull(tag, stream=True, decode=True))
             log(f"pulled docker image {tag}")
 
         return DockerImage(spec=self, tag=tag)
@@ -1,19 +1,14 @@
 """All the steps provided by the docker system."""
-import json
-
-import docker
 from attrs import define
 
 from treb.core.context import Context
 from treb.core.step import Step
 from treb.plugins.docker.artifacts import DockerImage, DockerImageSpec
-from treb.plugins.docker.utils import full_tag
+from treb.plugins.docker.utils import consume_stream, full_tag, get_client
 from treb.utils import log, print_waiting
 
-CLIENT = docker.from_env()
-
 
-@define(frozen=True, kw_only=True)
+@define(frozen=True, kw_only=True, slots=True)
 class DockerPush(Step):
     """Re-tag a local image and push it to a remote registry.
 
@@ -22,9 +17,7 @@ class DockerPush(Step):
         dest: spec of the image to push.
     """
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "docker_push"
+    spec_name = "docker_push"
 
     origin: DockerImage
 
@@ -40,12 +33,11 @@ class DockerPush(Step):
 
         dest_tag = full_tag(self.dest_image_name, self.dest_tag_prefix, ctx.revision)
 
-        image = CLIENT.images.get(self.origin.tag)
+        image = get_client().images.get(self.origin.tag)
         image.tag(dest_tag)
 
         with print_waiting("pushing docker image"):
-            res = CLIENT.images.push(dest_tag)
-            _check_push_result(res)
+            consume_stream(get_client().api.push(dest_tag, stream=True, decode=True))
 
             log(f"pushed docker image from {self.origin.tag} to {dest_tag}")
 
@@ -60,11 +52,3 @@ class DockerPush(Step):
 
     def rollback(self, ctx: Context, snapshot: None):
         pass
-
-
-def _check_push_result(output: str):
-    last_line = [line.strip() for line in output.split("\r\n") if line.strip()][-1]
-    data = json.loads(last_line)
-
-    if "error" in data:
-        raise Exception(data["error"])
@@ -1,4 +1,19 @@
 """Helpers for deploying Docker images."""
+from functools import lru_cache
+from typing import Any, Dict, Iterable
+
+import docker
+from docker.errors import APIError
+
+
+@lru_cache(maxsize=None)
+def get_client() -> docker.DockerClient:
+    """Returns the Docker client configured from the environment.
+
+    The client is created on first use, so importing the plugin does not
+    require a running Docker daemon.
+    """
+    return docker.from_env()
 
 
 def full_tag(image_name: str, tag_prefix: str, revision: str) -> str:
@@ -13,3 +28,21 @@ def full_tag(image_name: str, tag_prefix: str, revision: str) -> str:
         The full image tag (i.e. `ghcr.io/fucina/treb:rev-abc`)
     """
     return f"{image_name}:{tag_prefix}{revision}"
+
+
+def consume_stream(events: Iterable[Dict[str, Any]]):
+    """Reads all the events streamed by the Docker daemon while pulling or
+    pushing an image.
+
+    The events are discarded as they arrive, so the progress output is never
+    buffered in memory.
+
+    Arguments:
+        events: the decoded events returned by the Docker API.
+
+    Raises:
+        APIError: if the daemon reports an error.
+    """
+    for event in events:
+        if "error" in event:
+            raise APIError(event["error"])
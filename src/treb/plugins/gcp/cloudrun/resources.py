@@ -43,9 +43,7 @@ class CloudRunServiceSpec(Resource):
         image_name: the name of the image without the tag.
     """
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "gcp_cloudrun_service"
+    spec_name = "gcp_cloudrun_service"
 
     service_name: str
 
@@ -124,9 +124,7 @@ class CloudRunDeploy(Step):
         image: the new image to use in the Cloud Run service.
     """
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "gcp_cloudrun_deploy"
+    spec_name = "gcp_cloudrun_deploy"
 
     service: CloudRunServiceSpec
     image: DockerImage
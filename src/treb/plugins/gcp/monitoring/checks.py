@@ -93,9 +93,7 @@ class UptimeCheck(Check):
 
     reuse: bool = True
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "gcp_uptime_check"
+    spec_name = "gcp_uptime_check"
 
     def parent(self) -> str:
         """Constructs the full project path for this Uptime Check."""
@@ -17,9 +17,7 @@ class Wait(Step):
         duration: seconds to wait during the step execution.
     """
 
-    @classmethod
-    def spec_name(cls) -> str:
-        return "wait"
+    spec_name = "wait"
 
     duration: float
 
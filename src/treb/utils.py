@@ -1,5 +1,7 @@
 """Helper functions used acrosse the codebase."""
 import contextlib
+from functools import lru_cache
+from typing import Any, Callable, TypeVar, cast
 
 from rich.console import Console
 from rich.markup import escape
@@ -7,6 +9,23 @@ from rich.style import Style
 
 CONSOLE = Console()
 
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+
+
+def memoize(func: FuncT) -> FuncT:
+    """Caches all the results of a function while keeping its signature.
+
+    `functools.lru_cache` types its arguments as `Hashable`, which mypy does not
+    consider classes to be, so functions called with a class use this instead.
+
+    Arguments:
+        func: the function to cache.
+
+    Returns:
+        The cached function.
+    """
+    return cast(FuncT, lru_cache(maxsize=None)(func))
+
 
 def print_exception(message: str):
     """Prints an exception to console including its traceback.